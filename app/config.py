@@ -1,2 +1,21 @@
+import httpx
+
 DEFAULT_NEBIUS_API_BASE = "https://api.tokenfactory.nebius.com/v1/"
 DEFAULT_NEBIUS_MODEL = "Qwen/Qwen3-235B-A22B-Instruct-2507"
+DEFAULT_NEBIUS_EMBEDDING_MODEL = "Qwen/Qwen3-Embedding-8B"
+
+DEFAULT_LLM_CACHE_CAPACITY = 128
+DEFAULT_LLM_CACHE_TTL = 1800.0
+# Repositories per batched LLM call; small batches stay below the point where
+# a single long response costs more latency than it saves in request overhead.
+DEFAULT_LLM_BATCH_SIZE = 4
+# Maximum LLM API calls in flight at once per process.
+DEFAULT_LLM_CONCURRENCY = 8
+# Summaries kept per process, keyed by repository and head commit SHA.
+SUMMARY_CACHE_CAPACITY = 256
+
+# Shared by the GitHub and LLM HTTP clients, which live for the whole process
+# so that keep-alive connections are reused across requests.
+HTTP_POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=32, max_connections=64, keepalive_expiry=30
+)
@@ -1,10 +1,14 @@
 import logging
 
 import httpx
+from cachetools import LRUCache
 from dataclasses import dataclass
 
+from app.config import HTTP_POOL_LIMITS
+
 GITHUB_API = "https://api.github.com"
 REQUEST_TIMEOUT = 30.0
+HEAD_ETAG_CACHE_SIZE = 1024
 logger = logging.getLogger(__name__)
 
 
@@ -26,7 +30,15 @@ class GitHubClient:
         if token:
             headers["Authorization"] = f"Bearer {token}"
         self._client = httpx.AsyncClient(
-            headers=headers, timeout=REQUEST_TIMEOUT, follow_redirects=True
+            headers=headers,
+            timeout=REQUEST_TIMEOUT,
+            follow_redirects=True,
+            limits=HTTP_POOL_LIMITS,
+        )
+        # url -> (etag, sha); conditional requests answered with 304 do not
+        # count against the GitHub rate limit.
+        self._head_etags: LRUCache[str, tuple[str, str]] = LRUCache(
+            maxsize=HEAD_ETAG_CACHE_SIZE
         )
 
     async def close(self):
@@ -45,6 +57,29 @@ class GitHubClient:
         resp.raise_for_status()
         return resp.json()["default_branch"]
 
+    async def get_branch_head_sha(
+        self, owner: str, repo: str, branch: str
+    ) -> str | None:
+        url = f"{GITHUB_API}/repos/{owner}/{repo}/commits/{branch}"
+        headers = {"Accept": "application/vnd.github.sha"}
+        known = self._head_etags.get(url)
+        if known:
+            headers["If-None-Match"] = known[0]
+        try:
+            resp = await self._client.get(url, headers=headers)
+        except httpx.HTTPError as e:
+            logger.warning("Failed to fetch head commit for %s/%s: %s", owner, repo, e)
+            return None
+        if resp.status_code == 304 and known:
+            return known[1]
+        if resp.status_code != 200:
+            return None
+        sha = resp.text.strip()
+        etag = resp.headers.get("ETag")
+        if etag:
+            self._head_etags[url] = (etag, sha)
+        return sha
+
     async def get_repo_tree(
         self, owner: str, repo: str, branch: str
     ) -> list[RepoFile]:
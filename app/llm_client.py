@@ -1,13 +1,42 @@
-import json
+import asyncio
+import hashlib
 import logging
+import re
+from typing import Callable, Iterator, TypeVar
 
-from openai import AsyncOpenAI
+import msgspec
+from cachetools import TTLCache
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
-from app.config import DEFAULT_NEBIUS_API_BASE, DEFAULT_NEBIUS_MODEL
+from app.config import (
+    DEFAULT_LLM_BATCH_SIZE,
+    DEFAULT_LLM_CACHE_CAPACITY,
+    DEFAULT_LLM_CACHE_TTL,
+    DEFAULT_LLM_CONCURRENCY,
+    DEFAULT_NEBIUS_API_BASE,
+    DEFAULT_NEBIUS_EMBEDDING_MODEL,
+    DEFAULT_NEBIUS_MODEL,
+    HTTP_POOL_LIMITS,
+)
 from app.models import SummarizeResponse
+from app.repo_processor import MAX_CONTEXT_CHARS
+from app.semantic_cache import EmbeddingsCache
+
+# Embedding models have much smaller input limits than the chat model; the
+# directory tree and README lead the context, so the prefix is representative.
+MAX_EMBEDDING_INPUT_CHARS = 8_000
+
+# Completion budget per repository; batched calls scale it by the batch size.
+MAX_TOKENS_PER_SUMMARY = 800
+
+# Total context a batched call may carry: one full-size repository. Larger
+# contexts are summarized on their own.
+MAX_BATCH_CONTEXT_CHARS = MAX_CONTEXT_CHARS
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 SYSTEM_PROMPT = """\
 You are a software project analyst. You will receive:
 - the repository tree structure (or a compact summary for large repos)
@@ -45,61 +74,457 @@ Your task is to analyze this and return a JSON object with exactly three fields:
 Respond ONLY with valid JSON. No markdown, no code fences, no explanation outside the JSON.
 """
 
-USER_PROMPT_TEMPLATE = """\
-Repository: {owner}/{repo}
+# Appended to SYSTEM_PROMPT for batched calls, keeping the shared prefix intact.
+BATCH_SYSTEM_PROMPT = SYSTEM_PROMPT + """
+BATCH MODE: You will receive several repositories in one message. Each one starts with a
+"# Repository N: owner/repo" heading and repositories are separated by "---".
+Analyze each repository independently, applying every rule above to each one, and never
+mix evidence between repositories.
 
-{context}
+Respond with a single JSON object of the form {"results": [...]}, where "results" holds one
+object per repository, in the same order the repositories were given. Each object has the
+three fields above plus "repository", set to the "owner/repo" from that repository's heading.
 """
 
+# Built once and shared by every request; these are never mutated.
+_SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+_BATCH_SYSTEM_MESSAGE = {"role": "system", "content": BATCH_SYSTEM_PROMPT}
+_EXTRA_BODY = {"thinking": {"type": "disabled"}}
+
+# Appended on retries only; the original messages stay a cacheable prefix.
+_JSON_CORRECTION_MESSAGE = {
+    "role": "user",
+    "content": "Your previous reply was not valid JSON in the required shape. Return ONLY the JSON object.",
+}
+
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+
+# How many "{" positions salvage tries before giving up and retrying the call.
+MAX_SALVAGE_CANDIDATES = 8
+
 
 class LLMError(Exception):
     pass
 
 
+def _build_messages(owner: str, repo: str, context: str) -> list[dict[str, str]]:
+    # The repository header is sent as its own trailing message so that the
+    # system prompt and context form a byte-stable prefix the provider can cache.
+    return [
+        _SYSTEM_MESSAGE,
+        {"role": "user", "content": context},
+        {"role": "user", "content": f"Repository: {owner}/{repo}"},
+    ]
+
+
+class _SummaryPayload(msgspec.Struct):
+    """Wire format of one LLM summary; decoded in C, then handed to the API model."""
+
+    summary: str = ""
+    technologies: list[str] = []
+    structure: str = ""
+    # Only set in batched replies, where it ties each result to its input.
+    repository: str = ""
+
+
+class _BatchPayload(msgspec.Struct):
+    results: list[_SummaryPayload]
+
+
+_summary_decoder = msgspec.json.Decoder(_SummaryPayload)
+_batch_decoder = msgspec.json.Decoder(_BatchPayload)
+
+
+def _summary_from_payload(payload: _SummaryPayload) -> SummarizeResponse:
+    # Field types were already validated by msgspec. Duplicate technologies are
+    # dropped while keeping the model's significance ordering.
+    return SummarizeResponse.model_construct(
+        summary=payload.summary,
+        technologies=list(dict.fromkeys(payload.technologies)),
+        structure=payload.structure,
+    )
+
+
+def _parse_summary(raw: str) -> SummarizeResponse:
+    return _summary_from_payload(_summary_decoder.decode(raw))
+
+
+def _batch_parser(
+    repositories: list[str],
+) -> Callable[[str], list[SummarizeResponse]]:
+    """Build a parser that returns batched results in the order of ``repositories``.
+
+    Results are matched by their "owner/repo" field rather than by position, so a
+    reordered, missing or unexpected result fails parsing and triggers a retry.
+    """
+    expected = [name.lower() for name in repositories]
+
+    def parse(raw: str) -> list[SummarizeResponse]:
+        by_repository: dict[str, _SummaryPayload] = {}
+        for item in _batch_decoder.decode(raw).results:
+            name = item.repository.strip().lower()
+            if name not in expected:
+                raise ValueError(f"Unexpected repository {item.repository!r} in batched response")
+            if name in by_repository:
+                raise ValueError(f"Duplicate repository {item.repository!r} in batched response")
+            by_repository[name] = item
+        missing = [name for name in repositories if name.lower() not in by_repository]
+        if missing:
+            raise ValueError(f"Batched response is missing {', '.join(missing)}")
+        return [_summary_from_payload(by_repository[name]) for name in expected]
+
+    return parse
+
+
+def _salvage_candidates(raw: str) -> Iterator[str]:
+    """Yield JSON objects embedded in a reply wrapped in code fences or prose.
+
+    The fenced block comes first. The fence match stops at the first ``` even
+    inside a JSON string (e.g. markdown in the summary), so objects starting at
+    each of the first few "{" in the whole reply follow, which also skips past
+    stray braces in leading prose.
+    """
+    fenced = _CODE_FENCE_RE.search(raw)
+    if fenced:
+        body = fenced.group(1)
+        extracted = _extract_json_object(body, body.find("{"))
+        if extracted is not None:
+            yield extracted
+    start = raw.find("{")
+    for _ in range(MAX_SALVAGE_CANDIDATES):
+        if start == -1:
+            return
+        extracted = _extract_json_object(raw, start)
+        if extracted is not None:
+            yield extracted
+        start = raw.find("{", start + 1)
+
+
+def _extract_json_object(raw: str, start: int) -> str | None:
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(raw)):
+        char = raw[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return raw[start:index + 1]
+    return None
+
+
+def _parse_with_salvage(raw: str, parse: Callable[[str], T]) -> T:
+    try:
+        return parse(raw)
+    except Exception as e:
+        error = e
+    for candidate in _salvage_candidates(raw):
+        if candidate == raw:
+            continue
+        try:
+            result = parse(candidate)
+        except Exception:
+            continue
+        logger.info("Recovered JSON from malformed LLM response without retrying")
+        return result
+    raise error
+
+
+def _log_usage(response) -> None:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None) or 0
+    logger.debug(
+        "LLM usage: %s prompt tokens (%s cached), %s completion tokens",
+        usage.prompt_tokens,
+        cached_tokens,
+        usage.completion_tokens,
+    )
+
+
 class LLMClient:
     def __init__(
         self,
         api_key: str,
         base_url: str = DEFAULT_NEBIUS_API_BASE,
         model: str = DEFAULT_NEBIUS_MODEL,
+        cache_capacity: int = DEFAULT_LLM_CACHE_CAPACITY,
+        cache_ttl: float = DEFAULT_LLM_CACHE_TTL,
+        semantic_cache: bool = False,
+        embedding_model: str = DEFAULT_NEBIUS_EMBEDDING_MODEL,
+        batch_size: int = DEFAULT_LLM_BATCH_SIZE,
+        concurrency: int = DEFAULT_LLM_CONCURRENCY,
     ):
-        self._client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+        self._client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=DefaultAsyncHttpxClient(limits=HTTP_POOL_LIMITS),
+        )
         self._model = model
+        self._cache: TTLCache[str, SummarizeResponse] | None = (
+            TTLCache(maxsize=cache_capacity, ttl=cache_ttl) if cache_capacity > 0 else None
+        )
+        self._inflight: dict[str, asyncio.Future[SummarizeResponse]] = {}
+        self._embedding_model = embedding_model
+        self._semantic_cache = EmbeddingsCache(ttl=cache_ttl) if semantic_cache else None
+        self._batch_size = max(batch_size, 1)
+        self._semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def close(self):
+        await self._client.close()
+
+    def _cache_key(self, messages: list[dict[str, str]]) -> str:
+        digest = hashlib.blake2b(self._model.encode())
+        for message in messages:
+            digest.update(b"\0" + message["content"].encode())
+        return digest.hexdigest()
 
     async def summarize(
         self, owner: str, repo: str, context: str
     ) -> SummarizeResponse:
-        user_prompt = USER_PROMPT_TEMPLATE.format(
-            owner=owner, repo=repo, context=context
+        messages = _build_messages(owner, repo, context)
+        if self._cache is None:
+            return await self._summarize_uncached(owner, repo, context, messages)
+
+        key = self._cache_key(messages)
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.info("LLM response cache hit for %s/%s", owner, repo)
+            return cached
+
+        # Single-flight: concurrent identical requests await one shared task,
+        # so they all get its result (or its error) from a single LLM call.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._summarize_and_cache(key, owner, repo, context, messages)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish_inflight(key, t))
+        # Shielded so one cancelled caller doesn't cancel the call for the others.
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, key: str, task: asyncio.Future) -> None:
+        # Mark the error as retrieved: if every waiting caller was cancelled,
+        # nobody else will, and asyncio would log it as never retrieved.
+        if not task.cancelled():
+            task.exception()
+        self._inflight.pop(key, None)
+
+    async def _summarize_and_cache(
+        self,
+        key: str,
+        owner: str,
+        repo: str,
+        context: str,
+        messages: list[dict[str, str]],
+    ) -> SummarizeResponse:
+        result = await self._summarize_uncached(owner, repo, context, messages)
+        self._cache[key] = result
+        return result
+
+    async def summarize_many(
+        self, items: list[tuple[str, str, str]]
+    ) -> list[SummarizeResponse | Exception]:
+        """Summarize several (owner, repo, context) items, batching LLM calls.
+
+        Items found in the exact or semantic cache are served directly; the
+        rest are sent in groups of up to ``batch_size`` repositories and
+        ``MAX_BATCH_CONTEXT_CHARS`` of context per LLM call. Results keep the
+        input order; an item whose call failed gets that call's exception
+        instead of a summary, so one failed call doesn't discard the others.
+        """
+        if len(items) == 1 or self._batch_size == 1:
+            # Concurrency is bounded by the client's semaphore.
+            return list(
+                await asyncio.gather(
+                    *[self.summarize(*item) for item in items], return_exceptions=True
+                )
+            )
+
+        results: list[SummarizeResponse | Exception | None] = [None] * len(items)
+        pending: list[tuple[int, str | None]] = []
+        for index, (owner, repo, context) in enumerate(items):
+            key = None
+            if self._cache is not None:
+                key = self._cache_key(_build_messages(owner, repo, context))
+                cached = self._cache.get(key)
+                if cached is not None:
+                    logger.info("LLM response cache hit for %s/%s", owner, repo)
+                    results[index] = cached
+                    continue
+            pending.append((index, key))
+
+        embeddings: dict[int, list[float] | None] = {}
+        if self._semantic_cache is not None and pending:
+            vectors = await asyncio.gather(
+                *[self._embed(items[index][2]) for index, _ in pending]
+            )
+            misses: list[tuple[int, str | None]] = []
+            for (index, key), vector in zip(pending, vectors):
+                embeddings[index] = vector
+                owner, repo, _ = items[index]
+                hit = None
+                if vector is not None:
+                    hit = self._semantic_cache.lookup(owner, repo, vector)
+                if hit is None:
+                    misses.append((index, key))
+                    continue
+                logger.info("Semantic cache hit for %s/%s", owner, repo)
+                results[index] = hit
+                if key is not None:
+                    self._cache[key] = hit
+            pending = misses
+
+        async def _run_chunk(chunk: list[tuple[int, str | None]]) -> None:
+            try:
+                if len(chunk) == 1:
+                    owner, repo, context = items[chunk[0][0]]
+                    summaries = [
+                        await self._request_summary(_build_messages(owner, repo, context))
+                    ]
+                else:
+                    summaries = await self._request_batch([items[index] for index, _ in chunk])
+            except Exception as e:
+                for index, _ in chunk:
+                    results[index] = e
+                return
+
+            for (index, key), summary in zip(chunk, summaries):
+                results[index] = summary
+                if key is not None:
+                    self._cache[key] = summary
+                vector = embeddings.get(index)
+                if vector is not None:
+                    owner, repo, _ = items[index]
+                    self._semantic_cache.add(owner, repo, vector, summary)
+
+        # Chunks are independent; in-flight calls are bounded by the client's
+        # concurrency limit.
+        await asyncio.gather(*[_run_chunk(chunk) for chunk in self._chunk(items, pending)])
+        return results
+
+    def _chunk(
+        self, items: list[tuple[str, str, str]], pending: list[tuple[int, str | None]]
+    ) -> list[list[tuple[int, str | None]]]:
+        # Greedy, in input order: a chunk closes when it reaches the batch size
+        # or the next context would push it over the character budget.
+        chunks: list[list[tuple[int, str | None]]] = []
+        chunk: list[tuple[int, str | None]] = []
+        chunk_chars = 0
+        for entry in pending:
+            context_chars = len(items[entry[0]][2])
+            if chunk and (
+                len(chunk) >= self._batch_size
+                or chunk_chars + context_chars > MAX_BATCH_CONTEXT_CHARS
+            ):
+                chunks.append(chunk)
+                chunk, chunk_chars = [], 0
+            chunk.append(entry)
+            chunk_chars += context_chars
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    async def _summarize_uncached(
+        self, owner: str, repo: str, context: str, messages: list[dict[str, str]]
+    ) -> SummarizeResponse:
+        if self._semantic_cache is None:
+            return await self._request_summary(messages)
+
+        embedding = await self._embed(context)
+        if embedding is not None:
+            cached = self._semantic_cache.lookup(owner, repo, embedding)
+            if cached is not None:
+                logger.info("Semantic cache hit for %s/%s", owner, repo)
+                return cached
+
+        result = await self._request_summary(messages)
+        if embedding is not None:
+            self._semantic_cache.add(owner, repo, embedding, result)
+        return result
+
+    async def _embed(self, text: str) -> list[float] | None:
+        try:
+            async with self._semaphore:
+                response = await self._client.embeddings.create(
+                    model=self._embedding_model,
+                    input=text[:MAX_EMBEDDING_INPUT_CHARS],
+                )
+            return response.data[0].embedding
+        except Exception as e:
+            # The semantic cache is an optimization; never fail the request over it.
+            logger.warning("Embedding request failed, skipping semantic cache: %s", e)
+            return None
+
+    async def _request_summary(
+        self, messages: list[dict[str, str]]
+    ) -> SummarizeResponse:
+        return await self._request_json(messages, MAX_TOKENS_PER_SUMMARY, _parse_summary)
+
+    async def _request_batch(
+        self, items: list[tuple[str, str, str]]
+    ) -> list[SummarizeResponse]:
+        user_prompt = "\n---\n\n".join(
+            f"# Repository {index}: {owner}/{repo}\n\n{context}\n"
+            for index, (owner, repo, context) in enumerate(items, start=1)
         )
+        messages = [
+            _BATCH_SYSTEM_MESSAGE,
+            {"role": "user", "content": user_prompt},
+        ]
+        logger.info("Requesting batched summary for %d repositories", len(items))
+        return await self._request_json(
+            messages,
+            MAX_TOKENS_PER_SUMMARY * len(items),
+            _batch_parser([f"{owner}/{repo}" for owner, repo, _ in items]),
+        )
+
+    async def _request_json(
+        self,
+        messages: list[dict[str, str]],
+        max_tokens: int,
+        parse: Callable[[str], T],
+    ) -> T:
         max_json_retries = 3
         for attempt in range(1, max_json_retries + 1):
+            # Retries run deterministically with a short corrective nudge.
+            retrying = attempt > 1
             try:
-                response = await self._client.chat.completions.create(
-                    model=self._model,
-                    extra_body={"thinking": {"type": "disabled"}},
-                    messages=[
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    temperature=0.2,
-                    max_tokens=800,
-                    response_format={"type": "json_object"},
-                )
+                async with self._semaphore:
+                    response = await self._client.chat.completions.create(
+                        model=self._model,
+                        extra_body=_EXTRA_BODY,
+                        messages=[*messages, _JSON_CORRECTION_MESSAGE] if retrying else messages,
+                        temperature=0.0 if retrying else 0.2,
+                        max_tokens=max_tokens,
+                        response_format={"type": "json_object"},
+                    )
             except Exception as e:
                 logger.error("LLM API call failed: %s", e)
                 raise LLMError(f"LLM API call failed: {e}") from e
 
+            _log_usage(response)
             raw = response.choices[0].message.content
             try:
                 if not raw:
                     raise ValueError("LLM returned an empty response")
-                data = json.loads(raw)
-                return SummarizeResponse(
-                    summary=data.get("summary", ""),
-                    technologies=data.get("technologies", []),
-                    structure=data.get("structure", ""),
-                )
+                return _parse_with_salvage(raw, parse)
             except Exception as e:
                 if attempt == max_json_retries:
                     logger.error(
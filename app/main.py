@@ -1,33 +1,96 @@
+import asyncio
+import atexit
 import logging
 import os
+import queue
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
 
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.config import (
+    DEFAULT_LLM_BATCH_SIZE,
+    DEFAULT_LLM_CONCURRENCY,
     DEFAULT_NEBIUS_API_BASE,
+    DEFAULT_NEBIUS_EMBEDDING_MODEL,
     DEFAULT_NEBIUS_MODEL,
+    SUMMARY_CACHE_CAPACITY,
 )
 from app.github_client import GitHubClient, GitHubClientError
 from app.llm_client import LLMClient, LLMError
-from app.models import ErrorResponse, SummarizeRequest, SummarizeResponse
+from app.models import (
+    ErrorResponse,
+    SummarizeBatchRequest,
+    SummarizeBatchResponse,
+    SummarizeRequest,
+    SummarizeResponse,
+)
 from app.repo_processor import collect_repo_context
 
+from cachetools import LRUCache
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 
 load_dotenv()
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-)
+
+def _configure_logging() -> None:
+    # Records are handed to a background thread for writing, so slow stdout
+    # never blocks the event loop. DEBUG is opt-in: at that level the HTTP and
+    # OpenAI clients log full request payloads, including the repo context.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(
+        logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    )
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+        handlers=[queue_handler],
+    )
+    # basicConfig is a no-op when the root logger already has handlers (e.g.
+    # configured by pytest or a host application); only start the writer thread
+    # when our handler was actually installed.
+    if queue_handler in logging.getLogger().handlers:
+        listener = QueueListener(log_queue, logging.StreamHandler())
+        listener.start()
+        atexit.register(listener.stop)
+
+
+_configure_logging()
 logger = logging.getLogger(__name__)
 
+# Created lazily on first use and shared across requests so HTTP keep-alive
+# connections are reused; closed when the app shuts down.
+_github_client: GitHubClient | None = None
+_llm_client: LLMClient | None = None
+
+# Summaries keyed by (owner, repo, head commit SHA). A hit skips the tree walk,
+# file fetches and LLM call entirely.
+_summary_cache: LRUCache[tuple[str, str, str], SummarizeResponse] = LRUCache(
+    maxsize=SUMMARY_CACHE_CAPACITY
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    global _github_client, _llm_client
+    if _github_client is not None:
+        await _github_client.close()
+        _github_client = None
+    if _llm_client is not None:
+        await _llm_client.close()
+        _llm_client = None
+
+
 app = FastAPI(
     title="GitHub Repository Summarizer",
     description="Analyzes a public GitHub repository and returns an LLM-generated summary.",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -36,7 +99,17 @@ def _is_llm_auth_error(error: Exception) -> bool:
     return any(token in msg for token in ("authenticate", "authentication", "unauthorized"))
 
 
+def _get_github_client() -> GitHubClient:
+    global _github_client
+    if _github_client is None:
+        _github_client = GitHubClient(token=os.environ.get("GITHUB_TOKEN"))
+    return _github_client
+
+
 def _get_llm_client() -> LLMClient:
+    global _llm_client
+    if _llm_client is not None:
+        return _llm_client
     api_key = os.environ.get("NEBIUS_API_KEY", "")
     if not api_key:
         raise HTTPException(
@@ -48,93 +121,175 @@ def _get_llm_client() -> LLMClient:
         )
     base_url = os.environ.get("NEBIUS_API_BASE", DEFAULT_NEBIUS_API_BASE)
     model = os.environ.get("NEBIUS_MODEL", DEFAULT_NEBIUS_MODEL)
-    return LLMClient(api_key=api_key, base_url=base_url, model=model)
+    semantic_cache = os.environ.get("SEMANTIC_CACHE", "").lower() in ("1", "true", "yes")
+    embedding_model = os.environ.get(
+        "NEBIUS_EMBEDDING_MODEL", DEFAULT_NEBIUS_EMBEDDING_MODEL
+    )
+    batch_size = int(os.environ.get("LLM_BATCH_SIZE", DEFAULT_LLM_BATCH_SIZE))
+    concurrency = int(os.environ.get("LLM_CONCURRENCY", DEFAULT_LLM_CONCURRENCY))
+    _llm_client = LLMClient(
+        api_key=api_key,
+        base_url=base_url,
+        model=model,
+        semantic_cache=semantic_cache,
+        embedding_model=embedding_model,
+        batch_size=batch_size,
+        concurrency=concurrency,
+    )
+    return _llm_client
 
 
-@app.post(
-    "/summarize",
-    response_model=SummarizeResponse,
-    responses={
-        400: {"model": ErrorResponse},
-        404: {"model": ErrorResponse},
-        500: {"model": ErrorResponse},
-        422: {"model": ErrorResponse},
-    },
-)
-async def summarize(request: SummarizeRequest):
-    owner, repo = request.parse_owner_repo()
-    logger.info("Summarizing repository: %s/%s", owner, repo)
+def _llm_http_exception(error: Exception) -> HTTPException:
+    if not isinstance(error, LLMError):
+        logger.error("Unexpected error during LLM summarization", exc_info=error)
+        return HTTPException(
+            status_code=500,
+            detail=f"Internal error during summarization: {error}",
+        )
+    logger.error("LLM error: %s", error)
+    if _is_llm_auth_error(error):
+        return HTTPException(
+            status_code=500,
+            detail=(
+                "LLM provider authentication failed. "
+                "Check NEBIUS_API_KEY and restart/reload the server if .env was changed."
+            ),
+        )
+    return HTTPException(
+        status_code=502,
+        detail="LLM processing failed. Check server logs for details.",
+    )
+
+
+@dataclass
+class _PreparedRepo:
+    owner: str
+    repo: str
+    # (owner, repo, head commit SHA); None when the SHA could not be resolved.
+    cache_key: tuple[str, str, str] | None
+    summary: SummarizeResponse | None = None
+    context: str | None = None
 
-    github_token = os.environ.get("GITHUB_TOKEN")
-    github = GitHubClient(token=github_token)
-    llm = _get_llm_client()
 
+def _remember_summary(prepared: _PreparedRepo, summary: SummarizeResponse) -> None:
+    prepared.summary = summary
+    if prepared.cache_key is not None:
+        _summary_cache[prepared.cache_key] = summary
+
+
+async def _prepare_repo(github: GitHubClient, owner: str, repo: str) -> _PreparedRepo:
+    """Return the cached summary for an unchanged repo, or fetch its context."""
     try:
         branch = await github.get_default_branch(owner, repo)
         logger.info("Default branch: %s", branch)
 
+        sha = await github.get_branch_head_sha(owner, repo, branch)
+        cache_key = (owner.lower(), repo.lower(), sha) if sha else None
+        if cache_key is not None:
+            cached = _summary_cache.get(cache_key)
+            if cached is not None:
+                logger.info("%s/%s unchanged at %s, using cached summary", owner, repo, sha)
+                return _PreparedRepo(owner, repo, cache_key, summary=cached)
+
         files = await github.get_repo_tree(owner, repo, branch)
         if not files:
-            return JSONResponse(
-                status_code=400,
-                content=ErrorResponse(
-                    message="Repository appears to be empty."
-                ).model_dump(),
-            )
+            raise HTTPException(status_code=400, detail="Repository appears to be empty.")
         logger.info("Found %d files in repo tree", len(files))
 
         context = await collect_repo_context(github, files)
         logger.info("Assembled context: %d characters", len(context))
+        return _PreparedRepo(owner, repo, cache_key, context=context)
 
+    except HTTPException:
+        raise
     except GitHubClientError as e:
         logger.warning("GitHub error: %s", e)
         status = 404 if "not found" in str(e).lower() else 502
-        return JSONResponse(
-            status_code=status,
-            content=ErrorResponse(message=str(e)).model_dump(),
-        )
+        raise HTTPException(status_code=status, detail=str(e)) from e
     except Exception as e:
         logger.exception("Unexpected error fetching repository")
-        return JSONResponse(
+        raise HTTPException(
             status_code=502,
-            content=ErrorResponse(
-                message=f"Failed to fetch repository data: {e}"
-            ).model_dump(),
-        )
-    finally:
-        await github.close()
+            detail=f"Failed to fetch repository data: {e}",
+        ) from e
+
+
+@app.post(
+    "/summarize",
+    response_model=SummarizeResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
+    },
+)
+async def summarize(request: SummarizeRequest):
+    owner, repo = request.parse_owner_repo()
+    logger.info("Summarizing repository: %s/%s", owner, repo)
+
+    prepared = await _prepare_repo(_get_github_client(), owner, repo)
+    if prepared.summary is not None:
+        return prepared.summary
 
+    llm = _get_llm_client()
     try:
-        result = await llm.summarize(owner, repo, context)
-        logger.info("Summary generated successfully")
-        return result
-    except LLMError as e:
-        logger.error("LLM error: %s", e)
-        if _is_llm_auth_error(e):
-            return JSONResponse(
-                status_code=500,
-                content=ErrorResponse(
-                    message=(
-                        "LLM provider authentication failed. "
-                        "Check NEBIUS_API_KEY and restart/reload the server if .env was changed."
-                    )
-                ).model_dump(),
-            )
-        return JSONResponse(
-            status_code=502,
-            content=ErrorResponse(
-                message="LLM processing failed. Check server logs for details."
-            ).model_dump(),
-        )
+        result = await llm.summarize(owner, repo, prepared.context)
     except Exception as e:
-        logger.exception("Unexpected error during LLM summarization")
-        return JSONResponse(
-            status_code=500,
-            content=ErrorResponse(
-                message=f"Internal error during summarization: {e}"
-            ).model_dump(),
+        raise _llm_http_exception(e) from e
+    _remember_summary(prepared, result)
+    logger.info("Summary generated successfully")
+    return result
+
+
+@app.post(
+    "/summarize_batch",
+    response_model=SummarizeBatchResponse,
+    responses={
+        500: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
+    },
+)
+async def summarize_batch(request: SummarizeBatchRequest):
+    owner_repos = request.parse_owner_repos()
+    logger.info("Summarizing %d repositories in batch", len(owner_repos))
+
+    github = _get_github_client()
+
+    async def _prepare_item(owner: str, repo: str) -> _PreparedRepo | ErrorResponse:
+        try:
+            return await _prepare_repo(github, owner, repo)
+        except HTTPException as e:
+            return ErrorResponse(message=f"{owner}/{repo}: {e.detail}")
+
+    # Per-repository failures are returned as errors, so no fetch can abort
+    # the others.
+    prepared = await asyncio.gather(
+        *[_prepare_item(owner, repo) for owner, repo in owner_repos]
+    )
+
+    pending = [
+        (index, p)
+        for index, p in enumerate(prepared)
+        if isinstance(p, _PreparedRepo) and p.summary is None
+    ]
+    if pending:
+        llm = _get_llm_client()
+        # A failed LLM call only fails the repositories it carried.
+        outcomes = await llm.summarize_many(
+            [(p.owner, p.repo, p.context) for _, p in pending]
         )
+        for (index, p), outcome in zip(pending, outcomes):
+            if isinstance(outcome, Exception):
+                error = _llm_http_exception(outcome)
+                prepared[index] = ErrorResponse(message=f"{p.owner}/{p.repo}: {error.detail}")
+            else:
+                _remember_summary(p, outcome)
 
+    logger.info("Batch summary generated successfully")
+    return SummarizeBatchResponse(
+        results=[p.summary if isinstance(p, _PreparedRepo) else p for p in prepared]
+    )
 
 
 @app.exception_handler(RequestValidationError)
@@ -142,7 +297,7 @@ async def request_validation_error_handler(request, exc):
     message = "Invalid request payload."
     if exc.errors():
         message = str(exc.errors()[0].get("msg", message))
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content=ErrorResponse(message=message).model_dump(),
     )
@@ -151,7 +306,7 @@ async def request_validation_error_handler(request, exc):
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     message = exc.detail if isinstance(exc.detail, str) else str(exc.detail)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=ErrorResponse(message=message).model_dump(),
     )
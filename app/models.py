@@ -1,6 +1,24 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 import re
 
+MAX_BATCH_REPOSITORIES = 16
+
+
+def _validate_github_url(v: str) -> str:
+    v = v.strip().rstrip("/")
+    pattern = r"^https?://github\.com/[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+$"
+    if not re.match(pattern, v):
+        raise ValueError(
+            "Invalid GitHub repository URL. "
+            "Expected format: https://github.com/owner/repo"
+        )
+    return v
+
+
+def _parse_owner_repo(github_url: str) -> tuple[str, str]:
+    parts = github_url.rstrip("/").split("/")
+    return parts[-2], parts[-1]
+
 
 class SummarizeRequest(BaseModel):
     github_url: str
@@ -8,18 +26,22 @@ class SummarizeRequest(BaseModel):
     @field_validator("github_url")
     @classmethod
     def validate_github_url(cls, v: str) -> str:
-        v = v.strip().rstrip("/")
-        pattern = r"^https?://github\.com/[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+$"
-        if not re.match(pattern, v):
-            raise ValueError(
-                "Invalid GitHub repository URL. "
-                "Expected format: https://github.com/owner/repo"
-            )
-        return v
+        return _validate_github_url(v)
 
     def parse_owner_repo(self) -> tuple[str, str]:
-        parts = self.github_url.rstrip("/").split("/")
-        return parts[-2], parts[-1]
+        return _parse_owner_repo(self.github_url)
+
+
+class SummarizeBatchRequest(BaseModel):
+    github_urls: list[str] = Field(min_length=1, max_length=MAX_BATCH_REPOSITORIES)
+
+    @field_validator("github_urls")
+    @classmethod
+    def validate_github_urls(cls, v: list[str]) -> list[str]:
+        return [_validate_github_url(url) for url in v]
+
+    def parse_owner_repos(self) -> list[tuple[str, str]]:
+        return [_parse_owner_repo(url) for url in self.github_urls]
 
 
 class SummarizeResponse(BaseModel):
@@ -31,3 +53,9 @@ class SummarizeResponse(BaseModel):
 class ErrorResponse(BaseModel):
     status: str = "error"
     message: str
+
+
+class SummarizeBatchResponse(BaseModel):
+    # One entry per requested URL, in request order; a repository that could
+    # not be fetched gets an ErrorResponse without failing the others.
+    results: list[SummarizeResponse | ErrorResponse]
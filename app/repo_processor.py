@@ -9,6 +9,7 @@ logger = logging.getLogger(__name__)
 MAX_CONTEXT_CHARS = 80_000
 MAX_FILE_CHARS = 15_000
 MAX_FILES_TO_FETCH = 40
+FETCH_CONCURRENCY = 16
 
 SKIP_DIRECTORIES = {
     "node_modules", ".git", "vendor", "dist", "build", "__pycache__",
@@ -276,7 +277,7 @@ async def collect_repo_context(
     prioritized = filter_files(files)
     to_fetch = prioritized[:MAX_FILES_TO_FETCH]
 
-    semaphore = asyncio.Semaphore(10)
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
 
     async def _fetch(f: RepoFile):
         async with semaphore:
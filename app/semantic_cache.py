@@ -0,0 +1,89 @@
+import math
+import time
+from array import array
+from collections import OrderedDict, deque
+
+from app.config import DEFAULT_LLM_CACHE_TTL
+from app.models import SummarizeResponse
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+DEFAULT_SEMANTIC_CACHE_CAPACITY = 256
+DEFAULT_ENTRIES_PER_REPOSITORY = 4
+
+
+def _normalize(vector: list[float]) -> array:
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return array("f", vector)
+    return array("f", (x / norm for x in vector))
+
+
+class EmbeddingsCache:
+    """Cosine-similarity index mapping prompt embeddings to summaries.
+
+    Lookups only compare against earlier contexts of the same repository, so a
+    repo is never answered with another repo's summary. Up to ``capacity``
+    repositories are kept (least recently used evicted first), each holding its
+    ``entries_per_repository`` most recent embeddings. Entries older than ``ttl``
+    seconds are ignored, matching the exact-match response cache.
+
+    Lookups run on the event loop. They hold the GIL for about 0.3 ms per stored
+    4096-dim vector, which the per-repository bound keeps to roughly a millisecond.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        capacity: int = DEFAULT_SEMANTIC_CACHE_CAPACITY,
+        entries_per_repository: int = DEFAULT_ENTRIES_PER_REPOSITORY,
+        ttl: float = DEFAULT_LLM_CACHE_TTL,
+    ):
+        self._threshold = threshold
+        self._capacity = capacity
+        self._entries_per_repository = entries_per_repository
+        self._ttl = ttl
+        self._repos: OrderedDict[
+            tuple[str, str], deque[tuple[float, array, SummarizeResponse]]
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._repos.values())
+
+    def lookup(
+        self, owner: str, repo: str, embedding: list[float]
+    ) -> SummarizeResponse | None:
+        key = (owner.lower(), repo.lower())
+        entries = self._repos.get(key)
+        if not entries:
+            return None
+        self._repos.move_to_end(key)
+
+        oldest = time.monotonic() - self._ttl
+        query = _normalize(embedding)
+        best_score = -1.0
+        best: SummarizeResponse | None = None
+        for added_at, vector, response in entries:
+            if added_at < oldest or len(vector) != len(query):
+                continue
+            score = sum(a * b for a, b in zip(query, vector))
+            if score > best_score:
+                best_score, best = score, response
+        if best_score >= self._threshold:
+            return best
+        return None
+
+    def add(
+        self, owner: str, repo: str, embedding: list[float], response: SummarizeResponse
+    ) -> None:
+        if self._capacity <= 0 or self._entries_per_repository <= 0:
+            return
+        key = (owner.lower(), repo.lower())
+        vector = _normalize(embedding)
+        entries = self._repos.get(key)
+        if entries is None:
+            while len(self._repos) >= self._capacity:
+                self._repos.popitem(last=False)
+            entries = self._repos[key] = deque(maxlen=self._entries_per_repository)
+        else:
+            self._repos.move_to_end(key)
+        entries.append((time.monotonic(), vector, response))
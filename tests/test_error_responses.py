@@ -3,11 +3,12 @@ from fastapi.testclient import TestClient
 
 from app.github_client import RepoFile
 from app.llm_client import LLMError
-from app.main import app
+from app.main import _summary_cache, app
 
 
 @pytest.fixture()
 def client():
+    _summary_cache.clear()
     return TestClient(app)
 
 
@@ -47,6 +48,9 @@ def test_missing_nebius_api_key_returns_error_shape(client, monkeypatch):
     async def fake_get_default_branch(self, owner, repo):
         return "main"
 
+    async def fake_get_branch_head_sha(self, owner, repo, branch):
+        return "abc123"
+
     async def fake_get_repo_tree(self, owner, repo, branch):
         return [RepoFile(path="README.md", size=100)]
 
@@ -57,6 +61,10 @@ def test_missing_nebius_api_key_returns_error_shape(client, monkeypatch):
         "app.main.GitHubClient.get_default_branch",
         fake_get_default_branch,
     )
+    monkeypatch.setattr(
+        "app.main.GitHubClient.get_branch_head_sha",
+        fake_get_branch_head_sha,
+    )
     monkeypatch.setattr(
         "app.main.GitHubClient.get_repo_tree",
         fake_get_repo_tree,
@@ -79,6 +87,9 @@ def test_invalid_nebius_api_key_returns_auth_message(client, monkeypatch):
     async def fake_get_default_branch(self, owner, repo):
         return "main"
 
+    async def fake_get_branch_head_sha(self, owner, repo, branch):
+        return "abc123"
+
     async def fake_get_repo_tree(self, owner, repo, branch):
         return [RepoFile(path="README.md", size=100)]
 
@@ -93,6 +104,10 @@ def test_invalid_nebius_api_key_returns_auth_message(client, monkeypatch):
         "app.main.GitHubClient.get_default_branch",
         fake_get_default_branch,
     )
+    monkeypatch.setattr(
+        "app.main.GitHubClient.get_branch_head_sha",
+        fake_get_branch_head_sha,
+    )
     monkeypatch.setattr(
         "app.main.GitHubClient.get_repo_tree",
         fake_get_repo_tree,
@@ -0,0 +1,454 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.llm_client import SYSTEM_PROMPT, LLMClient, LLMError
+
+
+class _FakeCompletions:
+    def __init__(self, payloads: list[str], delay: float = 0):
+        self._payloads = list(payloads)
+        self._delay = delay
+        self.calls: list[dict] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(self._delay)
+        self.in_flight -= 1
+        content = self._payloads.pop(0) if len(self._payloads) > 1 else self._payloads[0]
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=None,
+        )
+
+
+class _FakeEmbeddings:
+    def __init__(self, vectors: dict[str, list[float]]):
+        self._vectors = vectors
+
+    async def create(self, model: str, input: str):
+        vector = next(v for marker, v in self._vectors.items() if marker in input)
+        return SimpleNamespace(data=[SimpleNamespace(embedding=vector)])
+
+
+def _make_client(
+    payloads: list[str],
+    embeddings: dict[str, list[float]] | None = None,
+    **kwargs,
+) -> tuple[LLMClient, _FakeCompletions]:
+    llm = LLMClient(api_key="test-key", **kwargs)
+    completions = _FakeCompletions(payloads)
+    llm._client = SimpleNamespace(
+        chat=SimpleNamespace(completions=completions),
+        embeddings=_FakeEmbeddings(embeddings or {}),
+    )
+    return llm, completions
+
+
+_VALID_PAYLOAD = json.dumps(
+    {
+        "summary": "A summary.",
+        "technologies": ["Python"],
+        "structure": "A structure.",
+    }
+)
+
+
+def _batch_payload(*repositories: str) -> str:
+    return json.dumps(
+        {"results": [{**json.loads(_VALID_PAYLOAD), "repository": name} for name in repositories]}
+    )
+
+
+class TestResponseCache:
+    def test_identical_requests_hit_cache(self):
+        llm, completions = _make_client([_VALID_PAYLOAD])
+
+        async def run():
+            first = await llm.summarize("psf", "requests", "context")
+            second = await llm.summarize("psf", "requests", "context")
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first == second
+        assert len(completions.calls) == 1
+
+    def test_different_context_misses_cache(self):
+        llm, completions = _make_client([_VALID_PAYLOAD])
+
+        async def run():
+            await llm.summarize("psf", "requests", "context")
+            await llm.summarize("psf", "requests", "changed context")
+
+        asyncio.run(run())
+
+        assert len(completions.calls) == 2
+
+    def test_concurrent_identical_requests_are_deduplicated(self):
+        llm, completions = _make_client([_VALID_PAYLOAD])
+
+        async def run():
+            return await asyncio.gather(
+                *[llm.summarize("psf", "requests", "context") for _ in range(5)]
+            )
+
+        results = asyncio.run(run())
+
+        assert all(r == results[0] for r in results)
+        assert len(completions.calls) == 1
+
+    def test_concurrent_identical_requests_share_failure(self):
+        llm, completions = _make_client(["not json at all"])
+
+        async def run():
+            return await asyncio.gather(
+                *[llm.summarize("psf", "requests", "context") for _ in range(5)],
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+
+        assert all(isinstance(r, LLMError) for r in results)
+        # A single 3-attempt run, not one per waiting caller.
+        assert len(completions.calls) == 3
+        assert llm._inflight == {}
+
+    def test_failure_after_all_callers_cancelled_is_retrieved(self):
+        llm, completions = _make_client(["not json at all"])
+        completions._delay = 0.01
+        unhandled: list[dict] = []
+
+        async def run():
+            asyncio.get_running_loop().set_exception_handler(
+                lambda loop, context: unhandled.append(context)
+            )
+            caller = asyncio.ensure_future(llm.summarize("psf", "requests", "context"))
+            await asyncio.sleep(0)
+            caller.cancel()
+            while llm._inflight:
+                await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+
+        assert len(completions.calls) == 3
+        assert unhandled == []
+
+    def test_zero_capacity_disables_cache(self):
+        llm, completions = _make_client([_VALID_PAYLOAD], cache_capacity=0)
+
+        async def run():
+            await llm.summarize("psf", "requests", "context")
+            await llm.summarize("psf", "requests", "context")
+
+        asyncio.run(run())
+
+        assert len(completions.calls) == 2
+
+
+class TestSemanticCache:
+    def test_near_duplicate_context_hits_semantic_cache(self):
+        llm, completions = _make_client(
+            [_VALID_PAYLOAD],
+            embeddings={"v1": [1.0, 0.0, 0.0], "v2": [0.99, 0.05, 0.0]},
+            semantic_cache=True,
+        )
+
+        async def run():
+            first = await llm.summarize("psf", "requests", "context v1")
+            second = await llm.summarize("psf", "requests", "context v2")
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first == second
+        assert len(completions.calls) == 1
+
+    def test_dissimilar_context_misses_semantic_cache(self):
+        llm, completions = _make_client(
+            [_VALID_PAYLOAD],
+            embeddings={"v1": [1.0, 0.0, 0.0], "v2": [0.0, 1.0, 0.0]},
+            semantic_cache=True,
+        )
+
+        async def run():
+            await llm.summarize("psf", "requests", "context v1")
+            await llm.summarize("psf", "requests", "context v2")
+
+        asyncio.run(run())
+
+        assert len(completions.calls) == 2
+
+    def test_expired_entry_misses_semantic_cache(self, monkeypatch):
+        llm, completions = _make_client(
+            [_VALID_PAYLOAD],
+            embeddings={"v1": [1.0, 0.0, 0.0], "v2": [0.99, 0.05, 0.0]},
+            semantic_cache=True,
+            cache_ttl=60,
+        )
+        now = [1000.0]
+        monkeypatch.setattr("app.semantic_cache.time.monotonic", lambda: now[0])
+
+        async def run():
+            await llm.summarize("psf", "requests", "context v1")
+            now[0] += 61
+            await llm.summarize("psf", "requests", "context v2")
+
+        asyncio.run(run())
+
+        assert len(completions.calls) == 2
+
+    def test_similar_context_of_other_repository_misses_semantic_cache(self):
+        llm, completions = _make_client(
+            [_VALID_PAYLOAD],
+            embeddings={"v1": [1.0, 0.0, 0.0], "v2": [1.0, 0.0, 0.0]},
+            semantic_cache=True,
+        )
+
+        async def run():
+            await llm.summarize("acme", "template-a", "context v1")
+            await llm.summarize("acme", "template-b", "context v2")
+
+        asyncio.run(run())
+
+        assert len(completions.calls) == 2
+
+
+class TestPromptLayout:
+    def test_static_prefix_precedes_repository_header(self):
+        llm, completions = _make_client([_VALID_PAYLOAD])
+
+        asyncio.run(llm.summarize("psf", "requests", "context"))
+
+        messages = completions.calls[0]["messages"]
+        assert messages[0] == {"role": "system", "content": SYSTEM_PROMPT}
+        assert messages[1] == {"role": "user", "content": "context"}
+        assert messages[-1] == {"role": "user", "content": "Repository: psf/requests"}
+
+
+class TestSummarizeMany:
+    def test_batches_repositories_into_single_call(self):
+        llm, completions = _make_client(
+            [_batch_payload("a/one", "b/two", "c/three")], batch_size=4
+        )
+
+        results = asyncio.run(
+            llm.summarize_many(
+                [("a", "one", "ctx 1"), ("b", "two", "ctx 2"), ("c", "three", "ctx 3")]
+            )
+        )
+
+        assert len(results) == 3
+        assert len(completions.calls) == 1
+        user_prompt = completions.calls[0]["messages"][-1]["content"]
+        assert "# Repository 1: a/one" in user_prompt
+        assert "# Repository 3: c/three" in user_prompt
+
+    def test_splits_into_chunks_of_batch_size(self):
+        llm, completions = _make_client(
+            [_batch_payload("o/repo0", "o/repo1"), _batch_payload("o/repo2", "o/repo3")],
+            batch_size=2,
+        )
+
+        results = asyncio.run(
+            llm.summarize_many([("o", f"repo{i}", f"ctx {i}") for i in range(4)])
+        )
+
+        assert len(results) == 4
+        assert len(completions.calls) == 2
+
+    def test_large_contexts_are_not_batched_together(self):
+        large = "x" * 50_000
+        llm, completions = _make_client([_VALID_PAYLOAD], batch_size=4)
+
+        results = asyncio.run(
+            llm.summarize_many([("a", "one", f"a {large}"), ("b", "two", f"b {large}")])
+        )
+
+        assert len(results) == 2
+        assert len(completions.calls) == 2
+        assert all(call["messages"][0]["content"] == SYSTEM_PROMPT for call in completions.calls)
+
+    def test_failed_chunk_only_fails_its_repositories(self):
+        llm, completions = _make_client(
+            [_batch_payload("o/repo0", "o/repo1"), "not json at all"], batch_size=2
+        )
+
+        results = asyncio.run(
+            llm.summarize_many([("o", f"repo{i}", f"ctx {i}") for i in range(4)])
+        )
+
+        assert [r.summary for r in results[:2]] == ["A summary.", "A summary."]
+        assert all(isinstance(r, LLMError) for r in results[2:])
+
+    def test_unbatched_repositories_are_summarized_concurrently(self):
+        llm, completions = _make_client([_VALID_PAYLOAD], batch_size=1)
+        completions._delay = 0.01
+
+        results = asyncio.run(
+            llm.summarize_many([("o", f"repo{i}", f"ctx {i}") for i in range(4)])
+        )
+
+        assert len(results) == 4
+        assert len(completions.calls) == 4
+        assert completions.peak_in_flight == 4
+
+    def test_cached_repositories_are_not_resent(self):
+        llm, completions = _make_client([_VALID_PAYLOAD])
+
+        async def run():
+            await llm.summarize("a", "one", "ctx 1")
+            return await llm.summarize_many([("a", "one", "ctx 1"), ("b", "two", "ctx 2")])
+
+        results = asyncio.run(run())
+
+        assert len(results) == 2
+        # One call for the initial summarize, one single-item call for the miss.
+        assert len(completions.calls) == 2
+        assert completions.calls[1]["messages"][0]["content"] == SYSTEM_PROMPT
+
+    def test_batched_repositories_use_semantic_cache(self):
+        llm, completions = _make_client(
+            [_VALID_PAYLOAD, _batch_payload("b/two", "c/three")],
+            embeddings={"a1": [1.0, 0.0], "a2": [0.99, 0.05], "b": [0.0, 1.0], "c": [0.5, 0.5]},
+            semantic_cache=True,
+            batch_size=4,
+        )
+
+        async def run():
+            await llm.summarize("a", "one", "ctx a1")
+            await llm.summarize_many(
+                [("a", "one", "ctx a2"), ("b", "two", "ctx b"), ("c", "three", "ctx c")]
+            )
+
+        asyncio.run(run())
+
+        # a/one is a semantic hit; only b/two and c/three go into the batch call.
+        assert len(completions.calls) == 2
+        batch_prompt = completions.calls[1]["messages"][-1]["content"]
+        assert "a/one" not in batch_prompt
+        assert "# Repository 2: c/three" in batch_prompt
+        assert len(llm._semantic_cache) == 3
+
+    def test_batched_results_are_matched_by_repository(self):
+        payload = json.dumps(
+            {
+                "results": [
+                    {"summary": "Second.", "repository": "B/Two"},
+                    {"summary": "First.", "repository": "a/one"},
+                ]
+            }
+        )
+        llm, completions = _make_client([payload], batch_size=4)
+
+        results = asyncio.run(
+            llm.summarize_many([("a", "one", "ctx 1"), ("b", "two", "ctx 2")])
+        )
+
+        assert [r.summary for r in results] == ["First.", "Second."]
+        assert len(completions.calls) == 1
+
+    def test_batched_result_for_unexpected_repository_triggers_retry(self):
+        llm, completions = _make_client(
+            [_batch_payload("a/one", "x/other"), _batch_payload("a/one", "b/two")],
+            batch_size=4,
+        )
+
+        results = asyncio.run(
+            llm.summarize_many([("a", "one", "ctx 1"), ("b", "two", "ctx 2")])
+        )
+
+        assert len(results) == 2
+        assert len(completions.calls) == 2
+
+
+class TestResponseParsing:
+    def test_wrongly_typed_field_triggers_retry(self):
+        invalid = json.dumps({"summary": "A summary.", "technologies": "Python", "structure": "x"})
+        llm, completions = _make_client([invalid, _VALID_PAYLOAD])
+
+        result = asyncio.run(llm.summarize("psf", "requests", "context"))
+
+        assert result.technologies == ["Python"]
+        assert len(completions.calls) == 2
+
+    def test_missing_fields_default_to_empty(self):
+        llm, _ = _make_client([json.dumps({"summary": "Only a summary."})])
+
+        result = asyncio.run(llm.summarize("psf", "requests", "context"))
+
+        assert result.summary == "Only a summary."
+        assert result.technologies == []
+        assert result.structure == ""
+
+    def test_duplicate_technologies_are_removed_in_order(self):
+        payload = json.dumps(
+            {
+                "summary": "A summary.",
+                "technologies": ["Python", "FastAPI", "Python", "httpx", "FastAPI"],
+                "structure": "A structure.",
+            }
+        )
+        llm, _ = _make_client([payload])
+
+        result = asyncio.run(llm.summarize("psf", "requests", "context"))
+
+        assert result.technologies == ["Python", "FastAPI", "httpx"]
+
+    def test_fenced_response_is_salvaged_without_retry(self):
+        fenced = f"Here is the analysis:\n```json\n{_VALID_PAYLOAD}\n```\nHope this helps!"
+        llm, completions = _make_client([fenced])
+
+        result = asyncio.run(llm.summarize("psf", "requests", "context"))
+
+        assert result.summary == "A summary."
+        assert len(completions.calls) == 1
+
+    def test_fenced_response_with_fence_inside_string_is_salvaged(self):
+        payload = json.dumps(
+            {
+                "summary": "Install it with:\n```bash\npip install requests\n```",
+                "technologies": ["Python"],
+                "structure": "x",
+            }
+        )
+        llm, completions = _make_client([f"```json\n{payload}\n```"])
+
+        result = asyncio.run(llm.summarize("psf", "requests", "context"))
+
+        assert result.summary == json.loads(payload)["summary"]
+        assert len(completions.calls) == 1
+
+    def test_prose_wrapped_response_is_salvaged_without_retry(self):
+        payload = json.dumps(
+            {"summary": 'Mentions "quoted }" braces.', "technologies": [], "structure": "x"}
+        )
+        llm, completions = _make_client([f"Sure! {payload} Let me know."])
+
+        result = asyncio.run(llm.summarize("psf", "requests", "context"))
+
+        assert result.summary == json.loads(payload)["summary"]
+        assert len(completions.calls) == 1
+
+    def test_object_after_braces_in_prose_is_salvaged_without_retry(self):
+        llm, completions = _make_client([f"Note {{x}}: {_VALID_PAYLOAD}"])
+
+        result = asyncio.run(llm.summarize("psf", "requests", "context"))
+
+        assert result.summary == "A summary."
+        assert len(completions.calls) == 1
+
+    def test_retry_is_deterministic_and_corrective(self):
+        llm, completions = _make_client(["not json at all", _VALID_PAYLOAD])
+
+        asyncio.run(llm.summarize("psf", "requests", "context"))
+
+        first, retry = completions.calls
+        assert first["temperature"] == 0.2
+        assert retry["temperature"] == 0.0
+        assert retry["messages"][:-1] == first["messages"]
+        assert "ONLY" in retry["messages"][-1]["content"]
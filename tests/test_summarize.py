@@ -1,19 +1,33 @@
 import pytest
 from fastapi.testclient import TestClient
 
-from app.github_client import RepoFile
-from app.main import app
+from app.github_client import GitHubClientError, RepoFile
+from app.llm_client import LLMError
+from app.main import _summary_cache, app
 from app.models import SummarizeResponse
 
 
 @pytest.fixture()
 def client():
+    _summary_cache.clear()
     return TestClient(app)
-def _mock_github_client(monkeypatch: pytest.MonkeyPatch, files_with_content: dict[str, str]):
+def _mock_github_client(
+    monkeypatch: pytest.MonkeyPatch,
+    files_with_content: dict[str, str],
+    head_sha: dict[str, str] | None = None,
+    tree_calls: list[str] | None = None,
+):
+    head_sha = head_sha if head_sha is not None else {"sha": "abc123"}
+
     async def fake_get_default_branch(self, owner, repo):
         return "main"
 
+    async def fake_get_branch_head_sha(self, owner, repo, branch):
+        return head_sha["sha"]
+
     async def fake_get_repo_tree(self, owner, repo, branch):
+        if tree_calls is not None:
+            tree_calls.append(f"{owner}/{repo}")
         return [
             RepoFile(path=path, size=len(content), download_url=f"https://example.test/{path}")
             for path, content in files_with_content.items()
@@ -23,21 +37,35 @@ def _mock_github_client(monkeypatch: pytest.MonkeyPatch, files_with_content: dic
         return files_with_content.get(file.path)
 
     monkeypatch.setattr("app.main.GitHubClient.get_default_branch", fake_get_default_branch)
+    monkeypatch.setattr("app.main.GitHubClient.get_branch_head_sha", fake_get_branch_head_sha)
     monkeypatch.setattr("app.main.GitHubClient.get_repo_tree", fake_get_repo_tree)
     monkeypatch.setattr("app.main.GitHubClient.fetch_file_content", fake_fetch_file_content)
 
 
 class _FakeLLMClient:
-    def __init__(self, result: SummarizeResponse, capture: dict[str, str]):
+    def __init__(
+        self,
+        result: SummarizeResponse,
+        capture: dict[str, str],
+        failures: dict[str, Exception] | None = None,
+    ):
         self._result = result
         self._capture = capture
+        self._failures = failures or {}
 
     async def summarize(self, owner: str, repo: str, context: str) -> SummarizeResponse:
+        self._capture["calls"] = self._capture.get("calls", 0) + 1
         self._capture["owner"] = owner
         self._capture["repo"] = repo
         self._capture["context"] = context
         return self._result
 
+    async def summarize_many(
+        self, items: list[tuple[str, str, str]]
+    ) -> list[SummarizeResponse | Exception]:
+        self._capture["items"] = items
+        return [self._failures.get(repo, self._result) for _, repo, _ in items]
+
 
 class TestSummarizeDeterministic:
     def test_returns_expected_summary_and_context_contains_evidence(self, client, monkeypatch):
@@ -74,10 +102,14 @@ class TestSummarizeDeterministic:
         async def fake_get_default_branch(self, owner, repo):
             return "main"
 
+        async def fake_get_branch_head_sha(self, owner, repo, branch):
+            return None
+
         async def fake_get_repo_tree(self, owner, repo, branch):
             return []
 
         monkeypatch.setattr("app.main.GitHubClient.get_default_branch", fake_get_default_branch)
+        monkeypatch.setattr("app.main.GitHubClient.get_branch_head_sha", fake_get_branch_head_sha)
         monkeypatch.setattr("app.main.GitHubClient.get_repo_tree", fake_get_repo_tree)
 
         response = client.post("/summarize", json={"github_url": "https://github.com/acme/empty-repo"})
@@ -94,3 +126,160 @@ class TestSummarizeDeterministic:
     def test_missing_github_url_returns_422(self, client):
         response = client.post("/summarize", json={})
         assert response.status_code == 422
+
+
+class TestSummarizeHeadShaCache:
+    def _expected(self) -> SummarizeResponse:
+        return SummarizeResponse(
+            summary="A project that does things.",
+            technologies=["Python"],
+            structure="Everything lives in the repository root.",
+        )
+
+    def test_unchanged_head_skips_tree_and_llm(self, client, monkeypatch):
+        tree_calls: list[str] = []
+        _mock_github_client(monkeypatch, {"README.md": "# Project"}, tree_calls=tree_calls)
+        capture: dict = {}
+        monkeypatch.setattr("app.main._get_llm_client", lambda: _FakeLLMClient(self._expected(), capture))
+
+        first = client.post("/summarize", json={"github_url": "https://github.com/acme/project"})
+        second = client.post("/summarize", json={"github_url": "https://github.com/acme/project"})
+
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        assert tree_calls == ["acme/project"]
+        assert capture["calls"] == 1
+
+    def test_new_head_commit_reruns_pipeline(self, client, monkeypatch):
+        head_sha = {"sha": "abc123"}
+        tree_calls: list[str] = []
+        _mock_github_client(monkeypatch, {"README.md": "# Project"}, head_sha=head_sha, tree_calls=tree_calls)
+        capture: dict = {}
+        monkeypatch.setattr("app.main._get_llm_client", lambda: _FakeLLMClient(self._expected(), capture))
+
+        client.post("/summarize", json={"github_url": "https://github.com/acme/project"})
+        head_sha["sha"] = "def456"
+        client.post("/summarize", json={"github_url": "https://github.com/acme/project"})
+
+        assert tree_calls == ["acme/project", "acme/project"]
+        assert capture["calls"] == 2
+
+    def test_unknown_head_is_not_cached(self, client, monkeypatch):
+        tree_calls: list[str] = []
+        _mock_github_client(monkeypatch, {"README.md": "# Project"}, head_sha={"sha": None}, tree_calls=tree_calls)
+        capture: dict = {}
+        monkeypatch.setattr("app.main._get_llm_client", lambda: _FakeLLMClient(self._expected(), capture))
+
+        client.post("/summarize", json={"github_url": "https://github.com/acme/project"})
+        client.post("/summarize", json={"github_url": "https://github.com/acme/project"})
+
+        assert capture["calls"] == 2
+
+
+class TestSummarizeBatchDeterministic:
+    def test_returns_result_per_repository_in_order(self, client, monkeypatch):
+        _mock_github_client(monkeypatch, {"README.md": "# Project\nDoes things."})
+
+        expected = SummarizeResponse(
+            summary="A project that does things.",
+            technologies=["Python"],
+            structure="Everything lives in the repository root.",
+        )
+        capture: dict = {}
+        monkeypatch.setattr("app.main._get_llm_client", lambda: _FakeLLMClient(expected, capture))
+
+        response = client.post(
+            "/summarize_batch",
+            json={"github_urls": ["https://github.com/psf/requests", "https://github.com/pallets/flask"]},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"results": [expected.model_dump(), expected.model_dump()]}
+        assert [(owner, repo) for owner, repo, _ in capture["items"]] == [
+            ("psf", "requests"),
+            ("pallets", "flask"),
+        ]
+
+    def test_cached_repositories_are_not_resummarized(self, client, monkeypatch):
+        _mock_github_client(monkeypatch, {"README.md": "# Project\nDoes things."})
+        expected = SummarizeResponse(
+            summary="A project that does things.",
+            technologies=["Python"],
+            structure="Everything lives in the repository root.",
+        )
+        capture: dict = {}
+        monkeypatch.setattr("app.main._get_llm_client", lambda: _FakeLLMClient(expected, capture))
+
+        client.post("/summarize", json={"github_url": "https://github.com/psf/requests"})
+        response = client.post(
+            "/summarize_batch",
+            json={"github_urls": ["https://github.com/psf/requests", "https://github.com/pallets/flask"]},
+        )
+
+        assert response.status_code == 200
+        assert len(response.json()["results"]) == 2
+        assert [(owner, repo) for owner, repo, _ in capture["items"]] == [("pallets", "flask")]
+
+    def test_failing_repository_does_not_fail_batch(self, client, monkeypatch):
+        _mock_github_client(monkeypatch, {"README.md": "# Project\nDoes things."})
+
+        async def fake_get_default_branch(self, owner, repo):
+            if repo == "missing":
+                raise GitHubClientError(f"Repository '{owner}/{repo}' not found.")
+            return "main"
+
+        monkeypatch.setattr("app.main.GitHubClient.get_default_branch", fake_get_default_branch)
+        expected = SummarizeResponse(
+            summary="A project that does things.",
+            technologies=["Python"],
+            structure="Everything lives in the repository root.",
+        )
+        capture: dict = {}
+        monkeypatch.setattr("app.main._get_llm_client", lambda: _FakeLLMClient(expected, capture))
+
+        response = client.post(
+            "/summarize_batch",
+            json={"github_urls": ["https://github.com/acme/missing", "https://github.com/psf/requests"]},
+        )
+
+        assert response.status_code == 200
+        missing, found = response.json()["results"]
+        assert missing["status"] == "error"
+        assert missing["message"].startswith("acme/missing:")
+        assert found == expected.model_dump()
+        assert [(owner, repo) for owner, repo, _ in capture["items"]] == [("psf", "requests")]
+
+    def test_failed_llm_call_only_fails_its_repositories(self, client, monkeypatch):
+        _mock_github_client(monkeypatch, {"README.md": "# Project\nDoes things."})
+        expected = SummarizeResponse(
+            summary="A project that does things.",
+            technologies=["Python"],
+            structure="Everything lives in the repository root.",
+        )
+        failures = {"flask": LLMError("LLM response parse/validation failed after 3 attempts")}
+        monkeypatch.setattr(
+            "app.main._get_llm_client",
+            lambda: _FakeLLMClient(expected, {}, failures),
+        )
+
+        response = client.post(
+            "/summarize_batch",
+            json={"github_urls": ["https://github.com/pallets/flask", "https://github.com/psf/requests"]},
+        )
+
+        assert response.status_code == 200
+        failed, found = response.json()["results"]
+        assert failed["status"] == "error"
+        assert failed["message"].startswith("pallets/flask:")
+        assert found == expected.model_dump()
+
+    def test_invalid_url_in_batch_returns_422(self, client):
+        response = client.post(
+            "/summarize_batch",
+            json={"github_urls": ["https://github.com/psf/requests", "not-a-github-url"]},
+        )
+        assert response.status_code == 422
+
+    def test_empty_batch_returns_422(self, client):
+        response = client.post("/summarize_batch", json={"github_urls": []})
+        assert response.status_code == 422
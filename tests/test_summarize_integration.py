@@ -8,7 +8,9 @@ from app.main import app
 
 @pytest.fixture()
 def client():
-    return TestClient(app)
+    # Run the app lifespan so the shared HTTP clients stay on one event loop.
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 def _skip_if_no_api_key():